@@ -4,10 +4,20 @@ Test Report Generator for Add to Cart Test Suite
 Generates comprehensive coverage report with pass/fail statistics
 """
 
+import argparse
+import base64
+import gzip
+import hashlib
+import heapq
+import html as html_lib
 import json
+import os
+import re
 from datetime import datetime
 from collections import defaultdict
 
+ERROR_PREVIEW_LENGTH = 500
+
 def parse_test_results(json_file):
     """Parse Cucumber JSON results"""
     with open(json_file, 'r') as f:
@@ -88,9 +98,303 @@ def analyze_results(data):
     
     return stats
 
-def generate_html_report(stats, output_file):
-    """Generate comprehensive HTML report"""
+class JSONStream:
+    """Incremental reader over a JSON document for walking its outer structure.
+
+    Structural characters are consumed one at a time while nested values
+    are decoded whole with json's C decoder. The buffer is compacted only
+    when more input is needed, so it holds at most the value being decoded
+    plus one read chunk.
+    """
+
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size):
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self._fill(self.chunk_size)
+
+    def accept(self, char):
+        if self.peek() == char:
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, char):
+        if not self.accept(char):
+            raise ValueError(f"Expected {char!r} in JSON stream, found {self.peek() or 'end of file'!r}")
+
+    def decode(self):
+        """Decode and consume the next complete JSON value"""
+        self.peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A value ending exactly at the buffer edge may be a truncated number
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            self._fill(read_size)
+            # Grow reads while a single value spans several chunks
+            read_size *= 2
+
+def stream_elements(json_file, chunk_size=1 << 16):
+    """Yield (feature, element) pairs from a Cucumber JSON file one element at a time.
+
+    Only one scenario element is decoded at once, so memory does not grow
+    with the size of a feature. The feature dict holds the feature's other
+    fields; Cucumber writes keys alphabetically, so fields after
+    'elements' (such as 'name') are only filled in once the feature closes.
+    """
+    with open(json_file, 'r') as f:
+        stream = JSONStream(f, chunk_size)
+        stream.expect('[')
+        if stream.accept(']'):
+            return
+        while True:
+            stream.expect('{')
+            feature = {}
+            if not stream.accept('}'):
+                while True:
+                    key = stream.decode()
+                    stream.expect(':')
+                    if key == 'elements':
+                        stream.expect('[')
+                        if not stream.accept(']'):
+                            while True:
+                                yield feature, stream.decode()
+                                if stream.accept(']'):
+                                    break
+                                stream.expect(',')
+                    else:
+                        feature[key] = stream.decode()
+                    if stream.accept('}'):
+                        break
+                    stream.expect(',')
+            if stream.accept(']'):
+                return
+            stream.expect(',')
+
+def iter_elements(data):
+    """Yield (feature, element) pairs from already parsed Cucumber JSON"""
+    for feature in data:
+        for element in feature.get('elements', []):
+            yield feature, element
+
+class FailureCounter:
+    """Space-Saving heavy-hitter counter with a fixed number of slots.
+
+    Tracks the most frequent failure messages in bounded memory. Each
+    reported count may overestimate the true count by at most `error`.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.slots = {}
+
+    def add(self, message):
+        slot = self.slots.get(message)
+        if slot is not None:
+            slot['count'] += 1
+            return
+        if len(self.slots) < self.capacity:
+            self.slots[message] = {'count': 1, 'error': 0}
+            return
+        evicted = min(self.slots, key=lambda key: self.slots[key]['count'])
+        floor = self.slots.pop(evicted)['count']
+        self.slots[message] = {'count': floor + 1, 'error': floor}
+
+    def top(self, k):
+        ranked = sorted(self.slots.items(), key=lambda item: item[1]['count'], reverse=True)[:k]
+        return [{'message': message, 'count': slot['count'], 'error': slot['error']} for message, slot in ranked]
+
+def summarize_results(elements, top_k=10):
+    """Compute totals, per-feature rates and top-K lists in one streaming pass.
+
+    Takes (feature, element) pairs from stream_elements or iter_elements.
+    Counts follow the same rules as analyze_results. Memory is bounded by
+    top_k and the number of distinct features, not by the number of
+    scenarios or steps. Like analyze_results, hidden hook steps are left
+    out of scenario durations.
+    """
+    if top_k < 1:
+        raise ValueError(f"top_k must be at least 1, got {top_k}")
+
+    summary = {
+        'total_scenarios': 0,
+        'passed_scenarios': 0,
+        'failed_scenarios': 0,
+        'total_steps': 0,
+        'passed_steps': 0,
+        'failed_steps': 0,
+        'skipped_steps': 0,
+        'features': {},
+        'slowest_scenarios': [],
+        'slowest_steps': [],
+        'top_failures': []
+    }
+    slowest_scenarios = []
+    slowest_steps = []
+    failures = FailureCounter(top_k * 10)
+    # Keyed by id(feature): a streamed feature's name may arrive after its elements
+    feature_counts = {}
+    seq = 0
+
+    for feature, element in elements:
+        if not (element.get('type') == 'scenario' or element.get('keyword') == 'Scenario'):
+            continue
+
+        scenario_name = element.get('name', 'Unknown Scenario')
+        scenario_status = 'passed'
+        scenario_duration_ms = 0
+        summary['total_scenarios'] += 1
+
+        for step in element.get('steps', []):
+            # Skip hidden steps (hooks)
+            if step.get('hidden'):
+                continue
+
+            step_result = step.get('result', {})
+            duration_ms = step_result.get('duration', 0) / 1000000
+            scenario_duration_ms += duration_ms
+            step_status = step_result.get('status', 'unknown')
+            summary['total_steps'] += 1
+
+            if step_status == 'passed':
+                summary['passed_steps'] += 1
+            elif step_status == 'failed':
+                summary['failed_steps'] += 1
+                if scenario_status == 'passed':
+                    error_message = step_result.get('error_message', 'No error message')
+                    failures.add(error_message.strip().split('\n', 1)[0][:200])
+                scenario_status = 'failed'
+            elif step_status == 'skipped':
+                summary['skipped_steps'] += 1
+
+            if len(slowest_steps) < top_k or duration_ms > slowest_steps[0][0]:
+                seq += 1
+                entry = (duration_ms, seq, {
+                    'feature': feature,
+                    'scenario': scenario_name,
+                    'step': f"{step.get('keyword', '').strip()} {step.get('name', '')}",
+                    'duration_ms': duration_ms
+                })
+                if len(slowest_steps) < top_k:
+                    heapq.heappush(slowest_steps, entry)
+                else:
+                    heapq.heapreplace(slowest_steps, entry)
+
+        counts = feature_counts.setdefault(id(feature), (feature, {'total': 0, 'passed': 0, 'failed': 0}))[1]
+        counts['total'] += 1
+        if scenario_status == 'passed':
+            summary['passed_scenarios'] += 1
+            counts['passed'] += 1
+        else:
+            summary['failed_scenarios'] += 1
+            counts['failed'] += 1
+
+        if len(slowest_scenarios) < top_k or scenario_duration_ms > slowest_scenarios[0][0]:
+            seq += 1
+            entry = (scenario_duration_ms, seq, {
+                'feature': feature,
+                'name': scenario_name,
+                'line': element.get('line', 0),
+                'status': scenario_status,
+                'duration_ms': scenario_duration_ms
+            })
+            if len(slowest_scenarios) < top_k:
+                heapq.heappush(slowest_scenarios, entry)
+            else:
+                heapq.heapreplace(slowest_scenarios, entry)
+
+    for feature, counts in feature_counts.values():
+        merged = summary['features'].setdefault(feature.get('name', 'Unknown Feature'), {'total': 0, 'passed': 0, 'failed': 0})
+        for key, value in counts.items():
+            merged[key] += value
+
+    summary['slowest_scenarios'] = [info for _, _, info in sorted(slowest_scenarios, reverse=True)]
+    summary['slowest_steps'] = [info for _, _, info in sorted(slowest_steps, reverse=True)]
+    for info in summary['slowest_scenarios'] + summary['slowest_steps']:
+        info['feature'] = info['feature'].get('name', 'Unknown Feature')
+    summary['top_failures'] = failures.top(top_k)
+    return summary
+
+def error_hash(message):
+    """Stable short content hash used to deduplicate error messages"""
+    return hashlib.sha256(message.encode('utf-8')).hexdigest()[:16]
+
+def write_error_payloads(stats, payload_dir):
+    """Store full error messages as deduplicated, gzip-compressed payload files.
+
+    Each distinct message is written once under its content hash as
+    <hash>.txt.gz (readable with zcat) and <hash>.js (loaded on demand by
+    the HTML report, which works from file:// URLs). Sets 'error_hash' on
+    every failed scenario, removes payloads left over from earlier runs
+    and returns the number of distinct payloads.
+    """
+    os.makedirs(payload_dir, exist_ok=True)
+    hashes = set()
+    
+    for scenario in stats['scenarios']:
+        if not scenario['error_message']:
+            continue
+        
+        digest = error_hash(scenario['error_message'])
+        scenario['error_hash'] = digest
+        if digest in hashes:
+            continue
+        hashes.add(digest)
+        
+        gz_path = os.path.join(payload_dir, f"{digest}.txt.gz")
+        js_path = os.path.join(payload_dir, f"{digest}.js")
+        if os.path.exists(gz_path) and os.path.exists(js_path):
+            continue
+        
+        # mtime=0 keeps payloads byte-identical across runs
+        compressed = gzip.compress(scenario['error_message'].encode('utf-8'), mtime=0)
+        with open(js_path, 'w') as f:
+            f.write(f"(window.__reportErrors = window.__reportErrors || {{}})['{digest}'] = '{base64.b64encode(compressed).decode('ascii')}';\n")
+        with open(gz_path, 'wb') as f:
+            f.write(compressed)
     
+    # Drop payloads for errors that are no longer part of this run
+    for name in os.listdir(payload_dir):
+        digest, _, extension = name.partition('.')
+        if extension in ('js', 'txt.gz') and digest not in hashes:
+            os.remove(os.path.join(payload_dir, name))
+    
+    return len(hashes)
+
+def generate_html_report(stats, output_file, payload_dir=None):
+    """Generate comprehensive HTML report
+    
+    Error messages longer than ERROR_PREVIEW_LENGTH show a preview; when
+    payload_dir holds their payloads the full text is loaded on expand.
+    """
+    
+    payload_src = os.path.relpath(payload_dir, os.path.dirname(os.path.abspath(output_file))) if payload_dir else None
     pass_rate = (stats['passed_scenarios'] / stats['total_scenarios'] * 100) if stats['total_scenarios'] > 0 else 0
     
     html = f"""<!DOCTYPE html>
@@ -365,6 +669,17 @@ def generate_html_report(stats, output_file):
             font-size: 1.1em;
         }}
         
+        .error-full summary {{
+            margin-top: 10px;
+            cursor: pointer;
+            color: #dc3545;
+            font-weight: bold;
+        }}
+        
+        .error-full-text {{
+            margin-top: 10px;
+        }}
+        
         .filter-buttons {{
             margin-bottom: 30px;
             display: flex;
@@ -512,15 +827,24 @@ def generate_html_report(stats, output_file):
 """
         
         if scenario['status'] == 'failed' and scenario['error_message']:
-            # Truncate very long error messages
+            # Long error messages show a preview; the full text loads on demand
             error_msg = scenario['error_message']
-            if len(error_msg) > 500:
-                error_msg = error_msg[:500] + '...\n[Error message truncated]'
+            full_error = ''
+            if len(error_msg) > ERROR_PREVIEW_LENGTH:
+                if payload_src and scenario.get('error_hash'):
+                    full_error = f"""
+                        <details class="error-full" data-error-hash="{scenario['error_hash']}" data-error-src="{payload_src}/{scenario['error_hash']}.js" ontoggle="loadFullError(this)">
+                            <summary>Show full error ({len(error_msg)} characters)</summary>
+                            <div class="error-full-text">Loading...</div>
+                        </details>"""
+                    error_msg = error_msg[:ERROR_PREVIEW_LENGTH] + '...'
+                else:
+                    error_msg = error_msg[:ERROR_PREVIEW_LENGTH] + '...\n[Error message truncated]'
             
             html += f"""
                     <div class="error-message">
                         <strong>❌ Error Details:</strong>
-                        {error_msg}
+                        <span class="error-preview">{html_lib.escape(error_msg)}</span>{full_error}
                     </div>
 """
         
@@ -557,6 +881,39 @@ def generate_html_report(stats, output_file):
             });
         }
         
+        // Load full error payloads on first expand
+        function loadFullError(details) {
+            const preview = details.parentElement.querySelector('.error-preview');
+            if (details.dataset.loaded === 'done') {
+                preview.style.display = details.open ? 'none' : '';
+                return;
+            }
+            if (!details.open || details.dataset.loaded) return;
+            details.dataset.loaded = 'loading';
+            
+            const hash = details.dataset.errorHash;
+            const target = details.querySelector('.error-full-text');
+            const script = document.createElement('script');
+            script.src = details.dataset.errorSrc;
+            script.onload = async () => {
+                try {
+                    const bytes = Uint8Array.from(atob(window.__reportErrors[hash]), c => c.charCodeAt(0));
+                    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+                    target.textContent = await new Response(stream).text();
+                    details.dataset.loaded = 'done';
+                    preview.style.display = details.open ? 'none' : '';
+                } catch (e) {
+                    target.textContent = 'Could not decode full error: ' + e;
+                    delete details.dataset.loaded;
+                }
+            };
+            script.onerror = () => {
+                target.textContent = 'Could not load full error from ' + script.src;
+                delete details.dataset.loaded;
+            };
+            document.head.appendChild(script);
+        }
+        
         // Add smooth scroll to top button
         window.addEventListener('scroll', function() {
             if (window.scrollY > 300) {
@@ -585,8 +942,18 @@ def generate_html_report(stats, output_file):
     
     return output_file
 
-def generate_markdown_report(stats, output_file):
-    """Generate detailed markdown report"""
+def generate_markdown_report(stats, output_file, payload_dir=None):
+    """Generate detailed markdown report
+    
+    Truncated error messages link to their full payload in payload_dir.
+    """
+    
+    payload_src = os.path.relpath(payload_dir, os.path.dirname(os.path.abspath(output_file))) if payload_dir else None
+    
+    def full_error_link(scenario, limit):
+        if payload_src and scenario.get('error_hash') and len(scenario['error_message']) > limit:
+            return f"[`{scenario['error_hash']}.txt.gz`]({payload_src}/{scenario['error_hash']}.txt.gz)"
+        return None
     
     pass_rate = (stats['passed_scenarios'] / stats['total_scenarios'] * 100) if stats['total_scenarios'] > 0 else 0
     
@@ -644,6 +1011,9 @@ def generate_markdown_report(stats, output_file):
             if scenario['error_message']:
                 error_preview = scenario['error_message'][:200] + '...' if len(scenario['error_message']) > 200 else scenario['error_message']
                 md += f"   - Error: `{error_preview}`\n"
+                error_link = full_error_link(scenario, 200)
+                if error_link:
+                    md += f"   - Full Error: {error_link}\n"
             md += f"   - Steps Executed: {len(scenario['steps'])}\n\n"
     
     # Complete step-by-step details
@@ -665,7 +1035,10 @@ def generate_markdown_report(stats, output_file):
                 md += f"   - Duration: {step['duration_ms']:.2f}ms\n\n"
         
         if scenario['status'] == 'failed' and scenario['error_message']:
-            md += f"\n**Error Details:**\n```\n{scenario['error_message'][:500]}\n```\n"
+            md += f"\n**Error Details:**\n```\n{scenario['error_message'][:ERROR_PREVIEW_LENGTH]}\n```\n"
+            error_link = full_error_link(scenario, ERROR_PREVIEW_LENGTH)
+            if error_link:
+                md += f"\n**Full Error:** {error_link}\n"
         
         md += "\n---\n"
     
@@ -694,35 +1067,146 @@ def generate_markdown_report(stats, output_file):
     
     return output_file
 
+def markdown_cell(text, code=False):
+    """Escape text for a Markdown table cell, optionally as an inline code span"""
+    text = str(text).replace('\n', ' ').replace('|', '\\|')
+    if not code:
+        return text.replace('`', '\\`')
+    # A code span fence must be longer than any backtick run inside it
+    fence = '`' * (max((len(run) for run in re.findall('`+', text)), default=0) + 1)
+    padding = ' ' if '`' in text else ''
+    return f"{fence}{padding}{text}{padding}{fence}"
+
+def generate_summary_report(summary, output_file):
+    """Generate a bounded-size markdown summary from summarize_results output"""
+    
+    pass_rate = (summary['passed_scenarios'] / summary['total_scenarios'] * 100) if summary['total_scenarios'] > 0 else 0
+    
+    md = f"""# Add to Cart - Test Summary Report
+
+**Generated:** {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
+
+---
+
+## Totals
+
+| Metric | Count |
+|--------|-------|
+| **Total Scenarios** | {summary['total_scenarios']} |
+| **✓ Passed Scenarios** | {summary['passed_scenarios']} |
+| **✗ Failed Scenarios** | {summary['failed_scenarios']} |
+| **Total Steps Executed** | {summary['total_steps']} |
+| **✓ Passed Steps** | {summary['passed_steps']} |
+| **✗ Failed Steps** | {summary['failed_steps']} |
+| **⊘ Skipped Steps** | {summary['skipped_steps']} |
+
+### Pass Rate: **{pass_rate:.1f}%**
+
+---
+
+## Per-Feature Pass Rates
+
+| Feature | Total | Passed | Failed | Pass Rate |
+|---------|-------|--------|--------|-----------|
+"""
+    
+    for feature, counts in summary['features'].items():
+        pass_rate_feature = (counts['passed'] / counts['total'] * 100) if counts['total'] > 0 else 0
+        md += f"| {markdown_cell(feature)} | {counts['total']} | {counts['passed']} | {counts['failed']} | {pass_rate_feature:.1f}% |\n"
+    
+    md += f"\n## Slowest Scenarios (Top {len(summary['slowest_scenarios'])})\n\n"
+    md += "| # | Scenario | Feature | Status | Duration |\n|---|----------|---------|--------|----------|\n"
+    for i, scenario in enumerate(summary['slowest_scenarios'], 1):
+        md += f"| {i} | {markdown_cell(scenario['name'])} | {markdown_cell(scenario['feature'])} | {scenario['status']} | {scenario['duration_ms']:.2f}ms |\n"
+    
+    md += f"\n## Slowest Steps (Top {len(summary['slowest_steps'])})\n\n"
+    md += "| # | Step | Scenario | Duration |\n|---|------|----------|----------|\n"
+    for i, step in enumerate(summary['slowest_steps'], 1):
+        md += f"| {i} | {markdown_cell(step['step'], code=True)} | {markdown_cell(step['scenario'])} | {step['duration_ms']:.2f}ms |\n"
+    
+    if summary['top_failures']:
+        md += f"\n## Most Frequent Failures (Top {len(summary['top_failures'])})\n\n"
+        md += "| # | Occurrences | Error |\n|---|-------------|-------|\n"
+        for i, failure in enumerate(summary['top_failures'], 1):
+            # Space-Saving counts are upper bounds once the counter has evicted entries
+            count = f"{failure['count']}" if failure['error'] == 0 else f"≤{failure['count']}"
+            md += f"| {i} | {count} | {markdown_cell(failure['message'], code=True)} |\n"
+    
+    with open(output_file, 'w') as f:
+        f.write(md)
+    
+    return output_file
+
+def positive_int(value):
+    """argparse type accepting integers greater than zero"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
 def main():
+    parser = argparse.ArgumentParser(description='Generate test coverage reports from Cucumber JSON results')
+    parser.add_argument('--input', default='test_results.json', help='Cucumber JSON results file (default: %(default)s)')
+    parser.add_argument('--summary', action='store_true', help='Also write a bounded-size summary report')
+    parser.add_argument('--summary-only', action='store_true', help='Write only the summary report in a single streaming pass')
+    parser.add_argument('--top-k', type=positive_int, default=10, help='Entries kept in each top-K summary list (default: %(default)s)')
+    args = parser.parse_args()
+    
     print("=" * 80)
     print("ADD TO CART TEST COVERAGE REPORT GENERATOR")
     print("=" * 80)
     print()
     
-    json_file = 'test_results.json'
+    json_file = args.input
     html_output = 'ADD_TO_CART_TEST_REPORT.html'
     md_output = 'ADD_TO_CART_TEST_REPORT.md'
+    summary_output = 'ADD_TO_CART_TEST_SUMMARY.md'
+    payload_dir = 'ADD_TO_CART_TEST_REPORT_errors'
     
-    print(f"📊 Parsing test results from: {json_file}")
-    data = parse_test_results(json_file)
-    
-    print(f"📈 Analyzing test results...")
-    stats = analyze_results(data)
-    
-    print(f"📝 Generating HTML report...")
-    html_file = generate_html_report(stats, html_output)
-    
-    print(f"📝 Generating Markdown report...")
-    md_file = generate_markdown_report(stats, md_output)
+    if args.summary_only:
+        print(f"📊 Streaming test results from: {json_file}")
+        stats = summarize_results(stream_elements(json_file), top_k=args.top_k)
+        
+        print(f"📝 Generating Summary report...")
+        summary_file = generate_summary_report(stats, summary_output)
+        
+        print()
+        print("=" * 80)
+        print("REPORT GENERATION COMPLETE!")
+        print("=" * 80)
+        print()
+        print(f"✓ Summary Report: {summary_file}")
+    else:
+        print(f"📊 Parsing test results from: {json_file}")
+        data = parse_test_results(json_file)
+        
+        print(f"📈 Analyzing test results...")
+        stats = analyze_results(data)
+        
+        print(f"🗜️  Storing full error payloads...")
+        payload_count = write_error_payloads(stats, payload_dir)
+        
+        print(f"📝 Generating HTML report...")
+        html_file = generate_html_report(stats, html_output, payload_dir)
+        
+        print(f"📝 Generating Markdown report...")
+        md_file = generate_markdown_report(stats, md_output, payload_dir)
+        
+        if args.summary:
+            print(f"📝 Generating Summary report...")
+            summary_file = generate_summary_report(summarize_results(iter_elements(data), top_k=args.top_k), summary_output)
+        
+        print()
+        print("=" * 80)
+        print("REPORT GENERATION COMPLETE!")
+        print("=" * 80)
+        print()
+        print(f"✓ HTML Report: {html_file}")
+        print(f"✓ Markdown Report: {md_file}")
+        print(f"✓ Error Payloads: {payload_dir}/ ({payload_count} unique)")
+        if args.summary:
+            print(f"✓ Summary Report: {summary_file}")
     
-    print()
-    print("=" * 80)
-    print("REPORT GENERATION COMPLETE!")
-    print("=" * 80)
-    print()
-    print(f"✓ HTML Report: {html_file}")
-    print(f"✓ Markdown Report: {md_file}")
     print()
     print("=" * 80)
     print("TEST SUMMARY")
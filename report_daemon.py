@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Report Daemon for the Test Automation Dashboard
+Keeps parsed test results and feature file indexes warm in memory and serves
+summary, scenario and history queries as JSON over a local HTTP endpoint
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from generate_test_report import analyze_results, parse_test_results
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 3002
+DEFAULT_RESULTS_FILES = ['test_results.json']
+DEFAULT_FEATURES_DIR = os.path.join('Ecomm', 'features')
+MAX_SCENARIO_PAGE = 1000
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache for rendered JSON responses"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def file_signature(path):
+    """Return (mtime_ns, size) for a file, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def parse_feature_file(path):
+    """Index scenarios and priority tags of a Gherkin feature file"""
+    scenarios = []
+    current_tags = []
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, raw_line in enumerate(f, 1):
+            line = raw_line.strip()
+
+            if line.startswith('@'):
+                current_tags.extend(t for t in line.split() if t.startswith('@'))
+            elif line.startswith('Scenario:') or line.startswith('Scenario Outline:'):
+                name = line.split(':', 1)[1].strip()
+                priority = 'Untagged'
+                for tag in ('@P1', '@P2', '@P3'):
+                    if tag in current_tags:
+                        priority = tag[1:]
+                        break
+                scenarios.append({
+                    'name': name,
+                    'line': line_no,
+                    'tags': current_tags,
+                    'priority': priority
+                })
+                current_tags = []
+            elif not line or line.startswith('Feature:') or line.startswith('#'):
+                current_tags = []
+
+    module = os.path.basename(path).replace('.feature', '').replace('-', ' ').title()
+    return {'module': module, 'file': os.path.basename(path), 'scenarios': scenarios}
+
+
+def summarize_stats(stats):
+    """Reduce analyzed stats to totals plus per-feature pass rates"""
+    features = {}
+    for scenario in stats['scenarios']:
+        counts = features.setdefault(scenario['feature'], {'total': 0, 'passed': 0, 'failed': 0})
+        counts['total'] += 1
+        if scenario['status'] == 'passed':
+            counts['passed'] += 1
+        else:
+            counts['failed'] += 1
+
+    for counts in features.values():
+        counts['pass_rate'] = round(counts['passed'] / counts['total'] * 100, 1) if counts['total'] > 0 else 0
+
+    summary = {key: value for key, value in stats.items() if key != 'scenarios'}
+    summary['pass_rate'] = round(stats['passed_scenarios'] / stats['total_scenarios'] * 100, 1) if stats['total_scenarios'] > 0 else 0
+    summary['features'] = features
+    return summary
+
+
+class ReportStore:
+    """Warm in-memory view of result files and feature files.
+
+    Each watched file is re-parsed only when its (mtime, size) signature
+    changes, so a refresh after one result file or one feature file is
+    edited touches only that file. Summaries and per-status/per-feature
+    scenario indexes are rebuilt on refresh, so queries only copy the page
+    they return. Rendered responses are cached per generation and dropped
+    whenever anything changes.
+    """
+
+    def __init__(self, results_files, features_dir, history_size=50, cache_size=256):
+        self.results_files = list(results_files)
+        self.features_dir = features_dir
+        self.generation = 0
+        self.cache = LRUCache(cache_size)
+        self._runs = {}
+        self._features = {}
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.RLock()
+        self._rebuild()
+
+    def refresh(self):
+        """Re-parse any result or feature file that changed; return True if anything did"""
+        results_changed = False
+
+        for path in self.results_files:
+            signature = file_signature(path)
+            cached = self._runs.get(path)
+            if cached is not None and cached['signature'] == signature:
+                continue
+            if signature is None:
+                if cached is not None:
+                    with self._lock:
+                        del self._runs[path]
+                    results_changed = True
+                continue
+            try:
+                stats = analyze_results(parse_test_results(path))
+            except (OSError, ValueError) as e:
+                # Cucumber may still be writing the file; keep the last good run
+                print(f"⚠️  Could not parse {path}: {e}")
+                continue
+
+            summary = summarize_stats(stats)
+            loaded_at = datetime.now().isoformat(timespec='seconds')
+            with self._lock:
+                self._runs[path] = {
+                    'signature': signature,
+                    'stats': stats,
+                    'summary': summary,
+                    'loaded_at': loaded_at
+                }
+                self._history.append({
+                    'file': path,
+                    'loaded_at': loaded_at,
+                    'total_scenarios': summary['total_scenarios'],
+                    'passed_scenarios': summary['passed_scenarios'],
+                    'failed_scenarios': summary['failed_scenarios'],
+                    'pass_rate': summary['pass_rate']
+                })
+            results_changed = True
+        changed = results_changed
+
+        if self.features_dir and os.path.isdir(self.features_dir):
+            present = set()
+            for name in sorted(os.listdir(self.features_dir)):
+                if not name.endswith('.feature'):
+                    continue
+                path = os.path.join(self.features_dir, name)
+                present.add(path)
+                signature = file_signature(path)
+                cached = self._features.get(path)
+                if cached is not None and cached['signature'] == signature:
+                    continue
+                try:
+                    index = parse_feature_file(path)
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"⚠️  Could not read {path}: {e}")
+                    continue
+                index['signature'] = signature
+                with self._lock:
+                    self._features[path] = index
+                changed = True
+
+            for path in set(self._features) - present:
+                with self._lock:
+                    del self._features[path]
+                changed = True
+
+        if changed:
+            with self._lock:
+                if results_changed:
+                    self._rebuild()
+                self.generation += 1
+            self.cache.clear()
+        return changed
+
+    def _rebuild(self):
+        """Merge loaded runs and build the scenario indexes queries slice from"""
+        totals = {
+            'total_scenarios': 0,
+            'passed_scenarios': 0,
+            'failed_scenarios': 0,
+            'total_steps': 0,
+            'passed_steps': 0,
+            'failed_steps': 0,
+            'skipped_steps': 0
+        }
+        features = {}
+        scenarios = []
+        by_status = {}
+        by_feature = {}
+        by_status_feature = {}
+
+        for path in self.results_files:
+            run = self._runs.get(path)
+            if run is None:
+                continue
+            for key in totals:
+                totals[key] += run['summary'][key]
+            for feature, counts in run['summary']['features'].items():
+                merged = features.setdefault(feature, {'total': 0, 'passed': 0, 'failed': 0})
+                for key in merged:
+                    merged[key] += counts[key]
+            for scenario in run['stats']['scenarios']:
+                index = len(scenarios)
+                scenarios.append(scenario)
+                by_status.setdefault(scenario['status'], []).append(index)
+                by_feature.setdefault(scenario['feature'], []).append(index)
+                by_status_feature.setdefault((scenario['status'], scenario['feature']), []).append(index)
+
+        for counts in features.values():
+            counts['pass_rate'] = round(counts['passed'] / counts['total'] * 100, 1) if counts['total'] > 0 else 0
+
+        summary = dict(totals)
+        summary['pass_rate'] = round(totals['passed_scenarios'] / totals['total_scenarios'] * 100, 1) if totals['total_scenarios'] > 0 else 0
+        summary['features'] = features
+
+        self._summary = summary
+        self._scenarios = scenarios
+        self._by_status = by_status
+        self._by_feature = by_feature
+        self._by_status_feature = by_status_feature
+
+    def summary(self):
+        with self._lock:
+            summary = dict(self._summary)
+            summary['generation'] = self.generation
+            summary['files'] = {path: run['loaded_at'] for path, run in self._runs.items()}
+        return summary
+
+    def scenarios(self, status=None, feature=None, offset=0, limit=100):
+        with self._lock:
+            scenarios = self._scenarios
+            if status is None and feature is None:
+                indexes = range(len(scenarios))
+            elif feature is None:
+                indexes = self._by_status.get(status, [])
+            elif status is None:
+                indexes = self._by_feature.get(feature, [])
+            else:
+                indexes = self._by_status_feature.get((status, feature), [])
+        return {
+            'total': len(indexes),
+            'offset': offset,
+            'limit': limit,
+            'scenarios': [dict(scenarios[i], index=i) for i in indexes[offset:offset + limit]]
+        }
+
+    def scenario(self, index):
+        with self._lock:
+            scenarios = self._scenarios
+        if 0 <= index < len(scenarios):
+            return dict(scenarios[index], index=index)
+        return None
+
+    def history(self):
+        with self._lock:
+            return {'runs': list(self._history)}
+
+    def features(self):
+        with self._lock:
+            modules = []
+            for path in sorted(self._features):
+                index = self._features[path]
+                counts = {'P1': 0, 'P2': 0, 'P3': 0, 'Untagged': 0}
+                for scenario in index['scenarios']:
+                    counts[scenario['priority']] += 1
+                modules.append({
+                    'module': index['module'],
+                    'file': index['file'],
+                    'total': len(index['scenarios']),
+                    'priorities': counts,
+                    'scenarios': index['scenarios']
+                })
+        return {'modules': modules}
+
+    def query(self, route, params):
+        """Return (status, body bytes) for a route, served from the LRU cache when warm"""
+        key = (self.generation, route, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        def first(name, default=None):
+            values = params.get(name)
+            return values[0] if values else default
+
+        status = 200
+        try:
+            if route == '/health':
+                payload = {'status': 'ok', 'generation': self.generation, 'cached_responses': len(self.cache)}
+            elif route == '/summary':
+                payload = self.summary()
+            elif route == '/scenarios':
+                offset = int(first('offset', 0))
+                limit = int(first('limit', 100))
+                if offset < 0 or limit < 0:
+                    raise ValueError
+                payload = self.scenarios(
+                    status=first('status'),
+                    feature=first('feature'),
+                    offset=offset,
+                    # Keep pages small enough to serialise within the latency budget
+                    limit=min(limit, MAX_SCENARIO_PAGE)
+                )
+            elif route.startswith('/scenarios/'):
+                payload = self.scenario(int(route.rsplit('/', 1)[1]))
+                if payload is None:
+                    status, payload = 404, {'error': 'Scenario not found'}
+            elif route == '/history':
+                payload = self.history()
+            elif route == '/features':
+                payload = self.features()
+            else:
+                status, payload = 404, {'error': f'Unknown endpoint: {route}'}
+        except ValueError:
+            status, payload = 400, {'error': 'Numeric parameters must be non-negative integers'}
+
+        response = (status, json.dumps(payload).encode('utf-8'))
+        # /health reports live counters, so it is never cached
+        if status == 200 and route != '/health':
+            self.cache.put(key, response)
+        return response
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """Serves ReportStore queries as JSON"""
+
+    protocol_version = 'HTTP/1.1'
+    store = None
+    verbose = False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = url.path.rstrip('/') or '/health'
+        status, body = self.store.query(route, parse_qs(url.query))
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def watch(store, interval, stop_event):
+    """Poll watched files and refresh the store until stop_event is set"""
+    while not stop_event.wait(interval):
+        store.refresh()
+
+
+def create_server(store, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    """Build an HTTP server bound to the given store"""
+    handler = type('BoundReportRequestHandler', (ReportRequestHandler,), {'store': store, 'verbose': verbose})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve warm test report data as JSON over local HTTP')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Interface to bind (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to listen on (default: %(default)s)')
+    parser.add_argument('--results', nargs='+', default=DEFAULT_RESULTS_FILES, help='Cucumber JSON result files to watch')
+    parser.add_argument('--features-dir', default=DEFAULT_FEATURES_DIR, help='Directory of .feature files to index')
+    parser.add_argument('--interval', type=float, default=1.0, help='Seconds between file change checks')
+    parser.add_argument('--cache-size', type=int, default=256, help='Maximum cached responses')
+    parser.add_argument('--history-size', type=int, default=50, help='Maximum run summaries kept in history')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("TEST REPORT DAEMON")
+    print("=" * 80)
+    print()
+
+    store = ReportStore(args.results, args.features_dir, history_size=args.history_size, cache_size=args.cache_size)
+    start = time.perf_counter()
+    store.refresh()
+    print(f"📊 Loaded {store.summary()['total_scenarios']} scenarios and {len(store.features()['modules'])} feature files in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    stop_event = threading.Event()
+    watcher = threading.Thread(target=watch, args=(store, args.interval, stop_event), daemon=True)
+    watcher.start()
+
+    server = create_server(store, args.host, args.port, args.verbose)
+    print(f"📡 Serving on http://{args.host}:{args.port}/")
+    print("   Endpoints: /summary /scenarios /scenarios/<index> /history /features /health")
+    print()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down...")
+    finally:
+        stop_event.set()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Report Publisher for Test Automation Results
+Pushes run summaries, per-scenario results and deduplicated failure records
+to HTTP endpoints in batches over pooled keep-alive connections
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from generate_test_report import analyze_results, error_hash, iter_elements, parse_test_results, summarize_results
+
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+MAX_RETRY_DELAY = 30.0
+
+
+class PublishError(Exception):
+    """Raised when a batch cannot be delivered after all retries"""
+
+
+class ConnectionPool:
+    """Minimal asyncio HTTP/1.1 client keeping keep-alive connections to one origin"""
+
+    def __init__(self, origin, max_connections=4, timeout=30.0):
+        parts = urlsplit(origin)
+        self.host = parts.hostname
+        # netloc keeps IPv6 brackets and omits default ports, as Host expects
+        self.netloc = parts.netloc.rpartition('@')[2]
+        self.use_ssl = parts.scheme == 'https'
+        self.port = parts.port or (443 if self.use_ssl else 80)
+        self.timeout = timeout
+        self._idle = []
+        self._semaphore = asyncio.Semaphore(max_connections)
+
+    async def _connect(self):
+        ssl_context = ssl.create_default_context() if self.use_ssl else None
+        return await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=ssl_context),
+            self.timeout
+        )
+
+    async def _exchange(self, connection, method, target, body, headers):
+        reader, writer = connection
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.netloc}", f"Content-Length: {len(body)}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError('Connection closed before response')
+            status = int(status_line.split()[1])
+
+            response_headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                response_headers[name.strip().lower()] = value.strip()
+
+            # Skip interim 1xx responses; the final response follows on the same connection
+            if status >= 200:
+                break
+
+        if status in (204, 304):
+            data = b''
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            data = b''
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                data += await reader.readexactly(size)
+                await reader.readline()
+        elif 'content-length' in response_headers:
+            data = await reader.readexactly(int(response_headers['content-length']))
+        else:
+            # No framing information: the body ends when the server closes the connection
+            data = await reader.read()
+            response_headers['connection'] = 'close'
+
+        reusable = response_headers.get('connection', '').lower() != 'close'
+        return status, response_headers, data, reusable
+
+    async def request(self, method, target, body=b'', headers=None):
+        """Send one request and return (status, headers, body bytes)"""
+        async with self._semaphore:
+            connection = None
+            while self._idle:
+                candidate = self._idle.pop()
+                if candidate[0].at_eof():
+                    candidate[1].close()
+                else:
+                    connection = candidate
+                    break
+            reused = connection is not None
+            if connection is None:
+                connection = await self._connect()
+
+            try:
+                status, response_headers, data, reusable = await asyncio.wait_for(
+                    self._exchange(connection, method, target, body, headers or {}),
+                    self.timeout
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[1].close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry once on a fresh one
+                connection = await self._connect()
+                try:
+                    status, response_headers, data, reusable = await asyncio.wait_for(
+                        self._exchange(connection, method, target, body, headers or {}),
+                        self.timeout
+                    )
+                except BaseException:
+                    connection[1].close()
+                    raise
+            except BaseException:
+                connection[1].close()
+                raise
+
+            if reusable:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+            return status, response_headers, data
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+def build_scenario_records(stats):
+    """Flatten analyzed scenarios into compact publishable records"""
+    records = []
+    for scenario in stats['scenarios']:
+        records.append({
+            'feature': scenario['feature'],
+            'name': scenario['name'],
+            'line': scenario['line'],
+            'status': scenario['status'],
+            'steps': len(scenario['steps']),
+            'duration_ms': sum(step['duration_ms'] for step in scenario['steps']),
+            'failed_step': scenario['failed_step'],
+            'error_hash': error_hash(scenario['error_message']) if scenario['error_message'] else None
+        })
+    return records
+
+
+def build_failure_records(stats):
+    """Group failed scenarios by error message so each distinct failure is sent once"""
+    failures = {}
+    for scenario in stats['scenarios']:
+        if scenario['status'] != 'failed' or not scenario['error_message']:
+            continue
+        digest = error_hash(scenario['error_message'])
+        record = failures.get(digest)
+        if record is None:
+            record = failures[digest] = {
+                'error_hash': digest,
+                'error_message': scenario['error_message'],
+                'failed_step': scenario['failed_step'],
+                'occurrences': 0,
+                'scenarios': []
+            }
+        record['occurrences'] += 1
+        record['scenarios'].append({'feature': scenario['feature'], 'name': scenario['name'], 'line': scenario['line']})
+    return list(failures.values())
+
+
+class ReportPublisher:
+    """Publishes analyzed results with batching, bounded concurrency and retries"""
+
+    def __init__(self, endpoints, headers=None, batch_size=1000, concurrency=4, retries=3, backoff=0.5, timeout=30.0):
+        self.endpoints = {kind: url for kind, url in endpoints.items() if url}
+        self.headers = dict(headers or {})
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.requests_sent = 0
+        self._pools = {}
+
+    def _pool_for(self, url):
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if origin not in self._pools:
+            self._pools[origin] = ConnectionPool(origin, self.concurrency, self.timeout)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        return self._pools[origin], target
+
+    async def _send(self, url, payload, idempotency_key):
+        pool, target = self._pool_for(url)
+        body = json.dumps(payload).encode('utf-8')
+        headers = dict(self.headers)
+        headers['Content-Type'] = 'application/json'
+        # Lets the receiving API discard duplicates delivered by retries
+        headers['Idempotency-Key'] = idempotency_key
+
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * (2 ** attempt) * (1 + random.random())
+            try:
+                self.requests_sent += 1
+                status, response_headers, data = await pool.request('POST', target, body, headers)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if status < 300:
+                    return status
+                error = f"HTTP {status}: {data[:200].decode('utf-8', 'replace')}"
+                if status not in RETRYABLE_STATUSES:
+                    raise PublishError(f"{url} rejected {idempotency_key}: {error}")
+                if response_headers.get('retry-after', '').isdigit():
+                    delay = float(response_headers['retry-after'])
+
+            if attempt < self.retries:
+                # Never let a server-supplied Retry-After stall the run
+                await asyncio.sleep(min(delay, MAX_RETRY_DELAY, self.timeout))
+
+        raise PublishError(f"{url} failed {idempotency_key} after {self.retries + 1} attempts: {error}")
+
+    async def publish(self, stats, summary, run_id):
+        """Publish summary, scenario and failure batches; return per-kind batch counts"""
+        jobs = []
+
+        if 'summary' in self.endpoints:
+            jobs.append(('summary', self.endpoints['summary'], {'run_id': run_id, 'summary': summary}, f"{run_id}-summary"))
+
+        for kind, records in (('scenarios', build_scenario_records), ('failures', build_failure_records)):
+            if kind not in self.endpoints:
+                continue
+            items = records(stats)
+            batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+            for index, batch in enumerate(batches):
+                payload = {
+                    'run_id': run_id,
+                    'batch': index,
+                    'total_batches': len(batches),
+                    kind: batch
+                }
+                jobs.append((kind, self.endpoints[kind], payload, f"{run_id}-{kind}-{index}"))
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(job):
+            async with semaphore:
+                await self._send(job[1], job[2], job[3])
+                return job[0]
+
+        try:
+            sent = await asyncio.gather(*(run(job) for job in jobs))
+        finally:
+            for pool in self._pools.values():
+                await pool.close()
+
+        counts = {}
+        for kind in sent:
+            counts[kind] = counts.get(kind, 0) + 1
+        return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Publish analyzed test results to HTTP endpoints')
+    parser.add_argument('--input', default='test_results.json', help='Cucumber JSON results file (default: %(default)s)')
+    parser.add_argument('--summary-url', help='Endpoint receiving the run summary')
+    parser.add_argument('--scenarios-url', help='Endpoint receiving batches of per-scenario results')
+    parser.add_argument('--failures-url', help='Endpoint receiving batches of deduplicated failure records')
+    parser.add_argument('--run-id', help='Identifier sent with every batch (default: current timestamp)')
+    parser.add_argument('--header', action='append', default=[], help="Extra request header as 'Name: value' (repeatable)")
+    parser.add_argument('--batch-size', type=int, default=1000, help='Records per request (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Maximum requests in flight (default: %(default)s)')
+    parser.add_argument('--retries', type=int, default=3, help='Retries per request after the first attempt (default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Seconds before a request times out (default: %(default)s)')
+    args = parser.parse_args()
+
+    endpoints = {
+        'summary': args.summary_url or os.environ.get('REPORT_SUMMARY_URL'),
+        'scenarios': args.scenarios_url or os.environ.get('REPORT_SCENARIOS_URL'),
+        'failures': args.failures_url or os.environ.get('REPORT_FAILURES_URL')
+    }
+    if not any(endpoints.values()):
+        parser.error('at least one of --summary-url, --scenarios-url or --failures-url is required')
+
+    headers = {}
+    if os.environ.get('REPORT_PUBLISH_TOKEN'):
+        headers['Authorization'] = f"Bearer {os.environ['REPORT_PUBLISH_TOKEN']}"
+    for header in args.header:
+        name, _, value = header.partition(':')
+        headers[name.strip()] = value.strip()
+
+    print("=" * 80)
+    print("TEST RESULTS PUBLISHER")
+    print("=" * 80)
+    print()
+
+    print(f"📊 Parsing test results from: {args.input}")
+    data = parse_test_results(args.input)
+    stats = analyze_results(data)
+    summary = summarize_results(iter_elements(data))
+    run_id = args.run_id or datetime.now().strftime('%Y%m%d-%H%M%S')
+
+    publisher = ReportPublisher(
+        endpoints,
+        headers=headers,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        retries=args.retries,
+        timeout=args.timeout
+    )
+
+    print(f"📡 Publishing run {run_id}...")
+    try:
+        counts = asyncio.run(publisher.publish(stats, summary, run_id))
+    except PublishError as e:
+        print(f"❌ Publishing failed: {e}")
+        raise SystemExit(1)
+
+    print()
+    print("=" * 80)
+    print("PUBLISHING COMPLETE!")
+    print("=" * 80)
+    for kind, count in counts.items():
+        print(f"✓ {kind.capitalize():<10} {count} batch(es) -> {endpoints[kind]}")
+    print(f"HTTP Requests:      {publisher.requests_sent}")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
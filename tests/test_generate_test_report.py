@@ -0,0 +1,159 @@
+import gzip
+import json
+import os
+import re
+import sys
+import tracemalloc
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_test_report import (
+    ERROR_PREVIEW_LENGTH, analyze_results, error_hash, generate_summary_report, iter_elements, parse_test_results,
+    stream_elements, summarize_results, write_error_payloads
+)
+
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'results.json')
+
+COUNT_KEYS = ['total_scenarios', 'passed_scenarios', 'failed_scenarios', 'total_steps', 'passed_steps', 'failed_steps', 'skipped_steps']
+
+
+def feature_rates(stats):
+    features = {}
+    for scenario in stats['scenarios']:
+        counts = features.setdefault(scenario['feature'], {'total': 0, 'passed': 0, 'failed': 0})
+        counts['total'] += 1
+        counts['passed' if scenario['status'] == 'passed' else 'failed'] += 1
+    return features
+
+
+def make_scenario(i):
+    failed = i % 7 == 0
+    return {
+        'id': f'big-feature;scenario-{i}',
+        'keyword': 'Scenario',
+        'line': i,
+        'name': f'Scenario {i}',
+        'type': 'scenario',
+        'steps': [
+            {'hidden': True, 'keyword': 'Before', 'result': {'duration': 1000000, 'status': 'passed'}},
+            {'keyword': 'Given ', 'name': 'I am on the home page', 'result': {'duration': (i % 97) * 1000000, 'status': 'passed'}},
+            {'keyword': 'When ', 'name': 'I add item to cart', 'result': {
+                'duration': (i % 13) * 1000000,
+                'status': 'failed' if failed else 'passed',
+                'error_message': f'Error: timeout {i % 3}\n    at step' if failed else None
+            }},
+            {'keyword': 'Then ', 'name': 'I see the cart', 'result': {'status': 'skipped' if failed else 'passed'}}
+        ]
+    }
+
+
+def test_streamed_summary_matches_analyze_results():
+    stats = analyze_results(parse_test_results(RESULTS_FILE))
+
+    for chunk_size in (7, 1 << 16):
+        summary = summarize_results(stream_elements(RESULTS_FILE, chunk_size=chunk_size))
+        for key in COUNT_KEYS:
+            assert summary[key] == stats[key], key
+        assert summary['features'] == feature_rates(stats)
+
+    assert summarize_results(stream_elements(RESULTS_FILE, chunk_size=7)) == summarize_results(iter_elements(parse_test_results(RESULTS_FILE)))
+
+
+def test_streamed_summary_of_one_large_feature(tmp_path):
+    scenario_count = 20000
+    results_file = tmp_path / 'big.json'
+    # sort_keys puts 'elements' before 'name', as Cucumber does
+    with open(results_file, 'w') as f:
+        json.dump([{
+            'elements': [make_scenario(i) for i in range(scenario_count)],
+            'keyword': 'Feature',
+            'name': 'Big Feature'
+        }], f, indent=2, sort_keys=True)
+
+    tracemalloc.start()
+    summary = summarize_results(stream_elements(str(results_file)), top_k=5)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = analyze_results(parse_test_results(str(results_file)))
+    for key in COUNT_KEYS:
+        assert summary[key] == stats[key], key
+    assert summary['features'] == feature_rates(stats)
+    assert len(summary['slowest_scenarios']) == 5
+    # Durations leave out hidden hooks, matching analyze_results
+    slowest = max(sum(step['duration_ms'] for step in scenario['steps']) for scenario in stats['scenarios'])
+    assert summary['slowest_scenarios'][0]['duration_ms'] == slowest
+    assert all(info['feature'] == 'Big Feature' for info in summary['slowest_scenarios'] + summary['slowest_steps'])
+    assert sorted(failure['message'] for failure in summary['top_failures']) == [f'Error: timeout {n}' for n in range(3)]
+    assert sum(failure['count'] for failure in summary['top_failures']) == stats['failed_scenarios']
+    # Peak memory stays far below the size of the file being summarized
+    assert peak < os.path.getsize(results_file) / 10
+
+
+def test_summarize_results_rejects_non_positive_top_k():
+    for top_k in (0, -1):
+        with pytest.raises(ValueError):
+            summarize_results(stream_elements(RESULTS_FILE), top_k=top_k)
+
+
+def test_summary_report_escapes_table_cells(tmp_path):
+    data = [{'name': 'Cart | Checkout', 'elements': [{
+        'keyword': 'Scenario',
+        'line': 3,
+        'name': 'Remove `item` | confirm',
+        'type': 'scenario',
+        'steps': [{'keyword': 'When ', 'name': "I click locator('a > b') | `x`", 'result': {
+            'duration': 5000000,
+            'status': 'failed',
+            'error_message': "locator.click: Timeout | waiting for `div` and ``span``\n    at step"
+        }}]
+    }]}]
+    output_file = tmp_path / 'summary.md'
+    generate_summary_report(summarize_results(iter_elements(data)), str(output_file))
+
+    report = output_file.read_text()
+    # Each table is a block of consecutive '|' lines; all rows need the header's unescaped pipe count
+    tables = re.findall(r'(?:^\|.*\n)+', report, re.M)
+    assert len(tables) == 5
+    for table in tables:
+        counts = {len(re.findall(r'(?<!\\)\|', row)) for row in table.splitlines()}
+        assert len(counts) == 1, table
+    assert '``` locator.click: Timeout \\| waiting for `div` and ``span`` ```' in report
+    assert 'Remove \\`item\\` \\| confirm' in report
+
+
+def failed_run(messages):
+    return analyze_results([{'name': 'Cart', 'elements': [{
+        'keyword': 'Scenario',
+        'line': i,
+        'name': f'Scenario {i}',
+        'type': 'scenario',
+        'steps': [{'keyword': 'When ', 'name': 'I add item to cart', 'result': {'status': 'failed', 'error_message': message}}]
+    } for i, message in enumerate(messages)]}])
+
+
+def test_write_error_payloads_dedupes_and_prunes(tmp_path):
+    payload_dir = tmp_path / 'errors'
+    kept = 'locator.click: Timeout 30000ms exceeded.\n' + '\n'.join(f'  - waiting for element {i}' for i in range(100))
+    dropped = 'Error: function timed out'
+    assert len(kept) > ERROR_PREVIEW_LENGTH
+
+    first = failed_run([kept, kept, dropped])
+    assert write_error_payloads(first, str(payload_dir)) == 2
+    assert sorted(os.listdir(payload_dir)) == sorted(f'{error_hash(m)}.{ext}' for m in (kept, dropped) for ext in ('js', 'txt.gz'))
+    assert {scenario['error_hash'] for scenario in first['scenarios']} == {error_hash(kept), error_hash(dropped)}
+
+    kept_gz = payload_dir / f'{error_hash(kept)}.txt.gz'
+    assert gzip.decompress(kept_gz.read_bytes()).decode('utf-8') == kept
+
+    # Unchanged payloads are not rewritten on the next run
+    os.utime(kept_gz, ns=(0, 0))
+    (payload_dir / 'notes.md').write_text('keep me')
+    (payload_dir / '0123456789abcdef.js').write_text('stale')
+
+    assert write_error_payloads(failed_run([kept]), str(payload_dir)) == 1
+    assert kept_gz.stat().st_mtime_ns == 0
+    assert sorted(os.listdir(payload_dir)) == sorted([f'{error_hash(kept)}.js', f'{error_hash(kept)}.txt.gz', 'notes.md'])
+    assert gzip.decompress(kept_gz.read_bytes()).decode('utf-8') == kept
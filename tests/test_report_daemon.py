@@ -0,0 +1,126 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import report_daemon
+from report_daemon import MAX_SCENARIO_PAGE, LRUCache, ReportStore
+
+
+def write_results(path, scenario_count, failed_every=0, feature='Cart'):
+    elements = []
+    for i in range(scenario_count):
+        failed = failed_every and i % failed_every == 0
+        elements.append({
+            'keyword': 'Scenario',
+            'line': i,
+            'name': f'Scenario {i}',
+            'type': 'scenario',
+            'steps': [{
+                'keyword': 'Given ',
+                'name': 'I open the cart',
+                'result': {'duration': 1000000, 'status': 'failed' if failed else 'passed', 'error_message': 'Error: boom' if failed else None}
+            }]
+        })
+    with open(path, 'w') as f:
+        json.dump([{'elements': elements, 'name': feature}], f)
+
+
+def query_json(store, route, **params):
+    status, body = store.query(route, {key: [str(value)] for key, value in params.items()})
+    return status, json.loads(body)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_refresh_reparses_only_changed_file(tmp_path, monkeypatch):
+    first = tmp_path / 'first.json'
+    second = tmp_path / 'second.json'
+    write_results(first, 3)
+    write_results(second, 4, feature='Checkout')
+
+    parsed = []
+    original = report_daemon.parse_test_results
+
+    def counting_parse(path):
+        parsed.append(os.path.basename(path))
+        return original(path)
+
+    monkeypatch.setattr(report_daemon, 'parse_test_results', counting_parse)
+    store = ReportStore([str(first), str(second)], None)
+
+    assert store.refresh()
+    assert sorted(parsed) == ['first.json', 'second.json']
+
+    parsed.clear()
+    assert not store.refresh()
+    assert parsed == []
+
+    write_results(second, 6, feature='Checkout')
+    assert store.refresh()
+    assert parsed == ['second.json']
+    assert query_json(store, '/summary')[1]['total_scenarios'] == 9
+
+
+def test_generation_change_resets_cache(tmp_path):
+    results = tmp_path / 'results.json'
+    write_results(results, 2)
+    store = ReportStore([str(results)], None)
+    store.refresh()
+
+    assert query_json(store, '/summary')[1]['total_scenarios'] == 2
+    assert len(store.cache) == 1
+    generation = store.generation
+
+    write_results(results, 5, failed_every=2)
+    store.refresh()
+
+    assert store.generation == generation + 1
+    assert len(store.cache) == 0
+    status, summary = query_json(store, '/summary')
+    assert status == 200
+    assert summary['total_scenarios'] == 5
+    assert summary['failed_scenarios'] == 3
+
+
+def test_scenarios_rejects_invalid_paging(tmp_path):
+    results = tmp_path / 'results.json'
+    write_results(results, 3)
+    store = ReportStore([str(results)], None)
+    store.refresh()
+
+    for params in ({'limit': -1}, {'offset': -5}, {'limit': 'abc'}, {'offset': '1.5'}):
+        status, payload = query_json(store, '/scenarios', **params)
+        assert status == 400, params
+        assert 'error' in payload
+    assert len(store.cache) == 0
+
+
+def test_scenarios_page_is_capped_and_filtered(tmp_path):
+    results = tmp_path / 'results.json'
+    write_results(results, MAX_SCENARIO_PAGE + 5, failed_every=10)
+    store = ReportStore([str(results)], None)
+    store.refresh()
+
+    status, page = query_json(store, '/scenarios', limit=MAX_SCENARIO_PAGE * 5)
+    assert status == 200
+    assert page['total'] == MAX_SCENARIO_PAGE + 5
+    assert page['limit'] == MAX_SCENARIO_PAGE
+    assert len(page['scenarios']) == MAX_SCENARIO_PAGE
+
+    status, page = query_json(store, '/scenarios', status='failed', offset=2, limit=3)
+    assert page['total'] == (MAX_SCENARIO_PAGE + 5 + 9) // 10
+    assert [scenario['index'] for scenario in page['scenarios']] == [20, 30, 40]
+    assert all(scenario['status'] == 'failed' for scenario in page['scenarios'])
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_test_report import analyze_results, iter_elements, summarize_results
+from report_publisher import PublishError, ReportPublisher
+
+
+def make_results(scenario_count, failed_every=10):
+    elements = []
+    for i in range(scenario_count):
+        failed = i % failed_every == 0
+        elements.append({
+            'keyword': 'Scenario',
+            'line': i,
+            'name': f'Scenario {i}',
+            'type': 'scenario',
+            'steps': [{
+                'keyword': 'When ',
+                'name': 'I add item to cart',
+                'result': {'duration': 1000000, 'status': 'failed' if failed else 'passed', 'error_message': f'Error: timeout {(i // failed_every) % 2}' if failed else None}
+            }]
+        })
+    return [{'elements': elements, 'name': 'Cart'}]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        key = self.headers['Idempotency-Key']
+        with self.server.lock:
+            attempt = sum(1 for request in self.server.requests if request['key'] == key)
+            self.server.requests.append({'path': self.path, 'key': key, 'payload': json.loads(body), 'client': self.client_address})
+        status, headers = self.server.respond(attempt)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 204:
+            self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(respond):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        server.respond = respond
+        server.requests = []
+        server.lock = threading.Lock()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def publish(publisher, data, run_id='run-1'):
+    stats = analyze_results(data)
+    return asyncio.run(publisher.publish(stats, summarize_results(iter_elements(data)), run_id))
+
+
+def endpoints(base_url):
+    return {
+        'summary': f"{base_url}/summary",
+        'scenarios': f"{base_url}/scenarios",
+        'failures': f"{base_url}/failures"
+    }
+
+
+def test_publish_batches_and_retries_on_503(stub_server):
+    # Every batch fails once with 503 before being accepted
+    server, base_url = stub_server(lambda attempt: (503, {}) if attempt == 0 else (200, {}))
+    publisher = ReportPublisher(endpoints(base_url), batch_size=1000, concurrency=2, backoff=0.01)
+
+    counts = publish(publisher, make_results(5000))
+
+    assert counts == {'summary': 1, 'scenarios': 5, 'failures': 1}
+    keys = [request['key'] for request in server.requests]
+    assert len(set(keys)) == 7
+    assert all(keys.count(key) == 2 for key in set(keys))
+    assert publisher.requests_sent == 14
+
+    accepted = {request['key']: request['payload'] for request in server.requests}
+    scenario_batches = [payload for key, payload in accepted.items() if '-scenarios-' in key]
+    assert sum(len(payload['scenarios']) for payload in scenario_batches) == 5000
+    assert all(payload['total_batches'] == 5 for payload in scenario_batches)
+    failure_batch = accepted['run-1-failures-0']['failures']
+    assert sorted(record['occurrences'] for record in failure_batch) == [250, 250]
+
+
+def test_client_error_raises_publish_error_without_retry(stub_server):
+    server, base_url = stub_server(lambda attempt: (400, {}))
+    publisher = ReportPublisher({'summary': f"{base_url}/summary"}, backoff=0.01)
+
+    with pytest.raises(PublishError):
+        publish(publisher, make_results(10))
+    assert len(server.requests) == 1
+
+
+def test_keep_alive_204_does_not_hang(stub_server):
+    server, base_url = stub_server(lambda attempt: (204, {}))
+    publisher = ReportPublisher(endpoints(base_url), batch_size=100, concurrency=1, timeout=2.0)
+
+    start = time.monotonic()
+    counts = publish(publisher, make_results(500))
+
+    assert time.monotonic() - start < 2.0
+    assert counts == {'summary': 1, 'scenarios': 5, 'failures': 1}
+    assert len(server.requests) == 7
+    # One keep-alive connection carried every request
+    assert len({request['client'] for request in server.requests}) == 1
+
+
+def test_retry_after_is_capped(stub_server):
+    server, base_url = stub_server(lambda attempt: (503, {'Retry-After': '3600'}) if attempt == 0 else (200, {}))
+    publisher = ReportPublisher({'summary': f"{base_url}/summary"}, timeout=0.2)
+
+    start = time.monotonic()
+    assert publish(publisher, make_results(10)) == {'summary': 1}
+    assert time.monotonic() - start < 2.0
+    assert len(server.requests) == 2